@@ -55,7 +55,8 @@ class SauceryArgumentParser(argparse.ArgumentParser):
         instance = Saucery(saucery=opts.saucery,
                            reductions=opts.reductions,
                            configfile=opts.configfile,
-                           dry_run=opts.dry_run)
+                           dry_run=opts.dry_run,
+                           reductions_threads=getattr(opts, 'reductions_threads', None))
 
         if opts.dumpconfig:
             logging.getLogger(__name__).info(instance.dumpconfig())
@@ -0,0 +1,29 @@
+
+import functools as _functools_
+
+from functools import * # noqa
+
+
+class cached_property(_functools_.cached_property):
+    '''Lock-free cached_property.
+
+    Before python 3.12, functools.cached_property takes a lock on every first access, and
+    the lock is shared by all instances of the class, so this skips the lock.
+
+    Our objects may be evaluated from multiple threads; Reductions.precompute() computes
+    independent references in a thread pool. It only computes a reference after all its
+    dependencies are computed, so a reference's own pathlist is computed by a single thread,
+    but properties of objects shared between references (e.g. the ReferencePaths of a common
+    source) may be computed by more than one thread at once. Without the lock, the worst case
+    is that two threads both compute the value, and the last one stored is kept; so this
+    must only be used for properties whose value is the same however many times it is
+    computed.
+    '''
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        if self.attrname is None:
+            raise TypeError('Cannot use cached_property instance without calling __set_name__')
+        value = self.func(instance)
+        instance.__dict__[self.attrname] = value
+        return value
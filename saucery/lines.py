@@ -1,11 +1,13 @@
 
 import re
 
+from bisect import bisect_right
 from contextlib import suppress
-from functools import cached_property
 from functools import partial
 from pathlib import Path
 
+from .functools import cached_property
+
 
 class PathLineOffsets(type(Path())):
     '''Detect the offset of each line in a file.
@@ -42,12 +44,10 @@ class PathLineOffsets(type(Path())):
         or None if the offset is outside our offset range or we could
         not determine our offsets.
         '''
-        line = 0
-        for o in self.line_offsets or []:
-            if o > offset:
-                break
-            line += 1
-        else:
+        # The offsets are sorted, so the line number is the count of offsets <= offset
+        offsets = self.line_offsets or []
+        line = bisect_right(offsets, offset)
+        if line == len(offsets):
             return None
         return line
 
@@ -72,7 +72,7 @@ class PathLineOffsets(type(Path())):
         Returns (None, None) if the range starts outside our offsets, or if we could not detect
         our offsets.
         '''
-        return (self.line(offset), self.line(offset + max(length, 1) - 1) or self.last_line)
+        return (self.line(offset), self.line(offset + max(length, 1) - 1) or self.last_line())
 
     @cached_property
     def line_offsets(self):
@@ -1,5 +1,5 @@
 
-from functools import cached_property
+from ...functools import cached_property
 
 from ..definition import InvalidDefinitionError
 from ..reference import ReferenceSourceDefinition
@@ -49,11 +49,11 @@ class Analysis(ReferenceSourceDefinition):
             self._raise(f"invalid level: '{level}'")
         return level
 
-    @property
+    @cached_property
     def results(self):
         '''The results of our analysis.
 
-        The default implementation here returns a new ReferencePathListResult object
+        The default implementation here returns a ReferencePathListResult object
         from our source pathlist.
         '''
         return ReferencePathListResult(self.source_pathlist)
@@ -61,15 +61,19 @@ class Analysis(ReferenceSourceDefinition):
     @property
     def conclusion(self):
         '''The conclusion for this analysis.'''
+        results = self.results
+        # The details are always included, so build them first; then the normal and abnormal
+        # states can check them, instead of each scanning the results again
+        details = results.details
         return {
             'name': self.get('name'),
             'level': self.level,
             'summary': self.get('summary'),
             'description': self.get('description'),
-            'normal': self.results.normal,
-            'abnormal': self.results.abnormal,
-            'unknown': self.results.unknown,
-            'details': self.results.details,
+            'normal': results.normal,
+            'abnormal': results.abnormal,
+            'unknown': results.unknown,
+            'details': details,
         }
 
 
@@ -102,10 +106,10 @@ class DictAnalysis(Analysis):
     def source_class(self):
         return DictReference
 
-    @property
+    @cached_property
     def results(self):
         '''The results of our analysis.
 
-        Returns a new ReferencePathDictResult object from our source pathdict.
+        Returns a ReferencePathDictResult object from our source pathdict.
         '''
         return ReferencePathDictResult(self.source_pathdict)
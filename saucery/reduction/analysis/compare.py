@@ -1,7 +1,7 @@
 
-from abc import abstractmethod
 from collections import ChainMap
-from functools import cached_property
+
+from ...functools import cached_property
 
 from .analysis import Analysis
 from .comparison import DictComparison
@@ -19,6 +19,8 @@ class ComparisonAnalysis(Analysis):
 
     This implementation has required keys:
       to: The value to compare to
+
+    Subclasses must set the 'comparison_class' class attribute to the Comparison class.
     '''
     @classmethod
     def _add_fields(cls):
@@ -26,11 +28,6 @@ class ComparisonAnalysis(Analysis):
             'to': str,
         }
 
-    @property
-    @abstractmethod
-    def comparison_class(self):
-        pass
-
     @property
     def comparison_a(self):
         return self.source_value
@@ -100,57 +97,47 @@ class TextComparisonAnalysis(ComparisonAnalysis):
 
 
 class LtAnalysis(ComparisonAnalysis):
+    comparison_class = NumberLtComparison
+
     @classmethod
     def TYPE(cls):
         return 'lt'
 
-    @property
-    def comparison_class(self):
-        return NumberLtComparison
-
 
 class LeAnalysis(ComparisonAnalysis):
+    comparison_class = NumberLeComparison
+
     @classmethod
     def TYPE(cls):
         return 'le'
 
-    @property
-    def comparison_class(self):
-        return NumberLeComparison
-
 
 class EqAnalysis(TextComparisonAnalysis):
+    comparison_class = StringEqComparison
+
     @classmethod
     def TYPE(cls):
         return 'eq'
 
-    @property
-    def comparison_class(self):
-        return StringEqComparison
-
 
 class GeAnalysis(ComparisonAnalysis):
+    comparison_class = NumberGeComparison
+
     @classmethod
     def TYPE(cls):
         return 'ge'
 
-    @property
-    def comparison_class(self):
-        return NumberGeComparison
-
 
 class GtAnalysis(ComparisonAnalysis):
+    comparison_class = NumberGtComparison
+
     @classmethod
     def TYPE(cls):
         return 'gt'
 
-    @property
-    def comparison_class(self):
-        return NumberGtComparison
-
 
-class DictAnalysis(ComparisonAnalysis):
-    '''DictAnalysis class.
+class DictComparisonAnalysis(ComparisonAnalysis):
+    '''DictComparisonAnalysis class.
 
     This compares two dictionaries.
 
@@ -215,37 +202,37 @@ class DictAnalysis(ComparisonAnalysis):
         return self.comparison.describe()
 
 
-class DictLtAnalysis(DictAnalysis, LtAnalysis):
+class DictLtAnalysis(DictComparisonAnalysis, LtAnalysis):
     @classmethod
     def TYPE(cls):
         return 'dictlt'
 
 
-class DictLeAnalysis(DictAnalysis, LeAnalysis):
+class DictLeAnalysis(DictComparisonAnalysis, LeAnalysis):
     @classmethod
     def TYPE(cls):
         return 'dictle'
 
 
-class DictEqAnalysis(DictAnalysis, EqAnalysis):
+class DictEqAnalysis(DictComparisonAnalysis, EqAnalysis):
     @classmethod
     def TYPE(cls):
         return 'dicteq'
 
 
-class DictGeAnalysis(DictAnalysis, GeAnalysis):
+class DictGeAnalysis(DictComparisonAnalysis, GeAnalysis):
     @classmethod
     def TYPE(cls):
         return 'dictge'
 
 
-class DictGtAnalysis(DictAnalysis, GtAnalysis):
+class DictGtAnalysis(DictComparisonAnalysis, GtAnalysis):
     @classmethod
     def TYPE(cls):
         return 'dictgt'
 
 
-class IndirectDictAnalysis(DictAnalysis):
+class IndirectDictAnalysis(DictComparisonAnalysis):
     @classmethod
     def _add_fields(cls):
         return {
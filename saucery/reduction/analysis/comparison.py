@@ -5,9 +5,10 @@ import re
 from abc import ABC
 from abc import abstractmethod
 from contextlib import suppress
-from functools import cached_property
 from functools import lru_cache
 
+from ...functools import cached_property
+
 from ..definition import InvalidDefinitionError
 
 
@@ -1,6 +1,5 @@
 
 from abc import abstractmethod
-from collections import ChainMap
 from itertools import chain
 
 from .analysis import Analysis
@@ -9,7 +8,8 @@ from .analysis import Analysis
 class LogicalAnalysis(Analysis):
     def setup(self):
         super().setup()
-        self.analyses = [self.anonymous(ChainMap({'source': self.source}, definition))
+        source = self.get('source')
+        self.analyses = [self.anonymous({**definition, 'source': source})
                          for definition in self.get(self.TYPE())]
 
     @property
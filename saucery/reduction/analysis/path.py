@@ -1,6 +1,7 @@
 
 from abc import abstractmethod
-from functools import cached_property
+
+from ...functools import cached_property
 
 
 class ReferencePathListResult(object):
@@ -5,18 +5,145 @@ import yaml
 
 from abc import ABC
 from abc import abstractmethod
-from collections import UserDict
-from contextlib import suppress
-from functools import cached_property
+from types import MappingProxyType
 
 from .. import json
 
 
+TRUE_STRINGS = frozenset(('true', 'yes', '1'))
+FALSE_STRINGS = frozenset(('false', 'no', '0'))
+
+
 class InvalidDefinitionError(Exception):
     pass
 
 
-class Definition(ABC, UserDict):
+class DefinitionField(object):
+    '''DefinitionField class.
+
+    The 'fieldtypes' should be set to a string for required type of
+    this field, or a list of possible types. The value must be one of
+    the FIELD_TYPES keys.
+
+    If 'fieldtypes' is set to only one of 'bool', 'int', 'text', or 'bytes',
+    the value will be coerced to that type. If 'list' is one of the
+    field types, the value will always be converted to a list.
+
+    If 'default' is set, it will be used if this field is not set,
+    and this field is considered optional; otherwise if 'default' is
+    not set, this field is required.
+
+    If 'conflicts' is set, it should be a list of field names this
+    field conflicts with.
+    '''
+    __slots__ = ('fieldclasses', 'default', 'conflicts',
+                 '_converter', '_islist', '_checkclasses', '_typedesc')
+
+    FIELD_CLASSES = [
+        bool,
+        bytes,
+        dict,
+        int,
+        list,
+        str,
+    ]
+
+    _SHARED = {}
+
+    @classmethod
+    def shared(cls, fieldclasses, *, default=None, conflicts=None):
+        '''Get a DefinitionField, shared with any other identical field.
+
+        Many definition classes have identical fields, and the fields are never modified, so
+        each distinct field only needs to be created once.
+        '''
+        classes = fieldclasses if isinstance(fieldclasses, list) else [fieldclasses]
+        key = (frozenset(classes), type(default), repr(default), tuple(conflicts or []))
+        field = cls._SHARED.get(key)
+        if field is None:
+            field = cls(fieldclasses, default=default, conflicts=conflicts)
+            cls._SHARED[key] = field
+        return field
+
+    def __init__(self, fieldclasses, *, default=None, conflicts=None):
+        if not isinstance(fieldclasses, list):
+            fieldclasses = [fieldclasses]
+        for c in fieldclasses:
+            if c not in self.FIELD_CLASSES:
+                raise InvalidDefinitionError(f"Invalid field class '{c}'")
+        self.fieldclasses = set(fieldclasses)
+        self.default = default
+        self.conflicts = conflicts or []
+        # Only a sole field class is coerced to, so pick its converter once here
+        self._converter = None
+        if len(self.fieldclasses) == 1:
+            fieldclass = next(iter(self.fieldclasses))
+            self._converter = getattr(self, f'_convert_{fieldclass.__name__}', None)
+        self._islist = list in self.fieldclasses
+        self._checkclasses = tuple(self.fieldclasses) + (type(None),)
+        self._typedesc = ','.join(self.fieldnames)
+
+    @property
+    def fieldnames(self):
+        return [c.__name__ for c in self.fieldclasses]
+
+    @staticmethod
+    def _convert_bool(value):
+        if isinstance(value, bool):
+            return value
+        value = str(value).strip().lower()
+        if value in TRUE_STRINGS:
+            return True
+        if value in FALSE_STRINGS:
+            return False
+        return value
+
+    @staticmethod
+    def _convert_int(value):
+        if type(value) is int:
+            return value
+        try:
+            return int(value)
+        except (TypeError, ValueError, OverflowError):
+            return value
+
+    @staticmethod
+    def _convert_str(value):
+        if isinstance(value, bytes):
+            try:
+                return value.decode()
+            except UnicodeDecodeError:
+                return value
+        return str(value)
+
+    @staticmethod
+    def _convert_bytes(value):
+        try:
+            if isinstance(value, str):
+                return value.encode()
+            return bytes(value)
+        except (TypeError, ValueError, OverflowError):
+            return value
+
+    def convert(self, value):
+        if value is None:
+            return None
+
+        if self._converter:
+            value = self._converter(value)
+
+        if self._islist:
+            if not isinstance(value, list):
+                value = [value]
+
+        return value
+
+    def check(self, value):
+        if not isinstance(value, self._checkclasses):
+            raise InvalidDefinitionError(f"invalid {self._typedesc} field: '{value}'")
+
+
+class Definition(ABC, dict):
     '''Definition object.
 
     This represents a definition entry.
@@ -52,6 +179,10 @@ class Definition(ABC, UserDict):
     @classmethod
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
+        cls._FIELDS = cls._fields()
+        cls._REQUIRED_FIELDS = frozenset(f for f, v in cls._FIELDS.items() if v.default is None)
+        cls._FIELD_CONFLICTS = {f: tuple(v.conflicts) for f, v in cls._FIELDS.items()
+                                if v.conflicts}
         if not inspect.isabstract(cls):
             cls.SUBCLASSES[cls.TYPE()] = cls
         elif cls.TYPE():
@@ -93,39 +224,40 @@ class Definition(ABC, UserDict):
         '''
         return None
 
-    CACHED_FIELDS = {}
-
     @classmethod
     def _fields(cls):
-        if cls.CACHED_FIELDS.get(cls):
-            return cls.CACHED_FIELDS.get(cls)
+        '''All fields for this class.
 
+        This walks our MRO to merge the fields added and removed by each class; it is called
+        once when each subclass is created, and the result is stored in cls._FIELDS. That is a
+        plain dict, as it is looked up for every definition value; the 'fields' property
+        provides a read-only view of it.
+        '''
         fields = {}
-        for c in reversed(inspect.getmro(cls)):
+        for c in reversed(cls.__mro__):
             if not issubclass(c, Definition):
                 continue
             add = {}
             defaults = {}
             conflicts = {}
-            if '_field_defaults' in c.__dict__.keys():
+            if '_field_defaults' in c.__dict__:
                 defaults = c._field_defaults() or {}
-            if '_field_conflicts' in c.__dict__.keys():
+            if '_field_conflicts' in c.__dict__:
                 conflicts = c._field_conflicts() or {}
-            if '_add_fields' in c.__dict__.keys():
+            if '_add_fields' in c.__dict__:
                 add = c._add_fields() or {}
                 fields.update({k: {'fieldclasses': v,
                                    'default': defaults.get(k),
                                    'conflicts': conflicts.get(k)}
                                for k, v in add.items()})
-            if '_remove_fields' in c.__dict__.keys():
+            if '_remove_fields' in c.__dict__:
                 for key in c._remove_fields() or []:
                     fields.pop(key, None)
-        cls.CACHED_FIELDS[cls] = {k: DefinitionField(**v) for k, v in fields.items()}
-        return cls.CACHED_FIELDS[cls]
+        return {k: DefinitionField.shared(**v) for k, v in fields.items()}
 
     @property
     def fields(self):
-        return self._fields()
+        return MappingProxyType(self._FIELDS)
 
     def __init__(self, definition, reductions, *, anonymous=False):
         '''Definition init.
@@ -153,17 +285,17 @@ class Definition(ABC, UserDict):
     def sos(self):
         return self.reductions.sos
 
-    @cached_property
+    @property
     def source(self):
-        return self.get('source')
+        return self._source_field
 
     @property
     def json(self):
-        return json.dumps(self.data)
+        return json.dumps(dict(self))
 
     @property
     def yaml(self):
-        return yaml.dump(self.data)
+        return yaml.dump(dict(self))
 
     def anonymous(self, definition, *args, **kwargs):
         return Definition(definition, self.reductions, anonymous=True, *args, **kwargs)
@@ -177,9 +309,20 @@ class Definition(ABC, UserDict):
         raise self.ERROR_CLASS(f'{clsname}({name}): {msg}', *args, **kwargs)
 
     def __missing__(self, field):
-        if field in self.fields:
-            return self.fields.get(field).default
-        raise KeyError(field)
+        definitionfield = self._FIELDS.get(field)
+        if definitionfield is None:
+            raise KeyError(field)
+        return definitionfield.default
+
+    def get(self, field, default=None):
+        '''Get a field value.
+
+        Unlike dict.get(), this returns the field default for any field that is not set.
+        '''
+        try:
+            return self[field]
+        except KeyError:
+            return default
 
     def setup(self):
         if self.get('type') != self.TYPE():
@@ -189,28 +332,34 @@ class Definition(ABC, UserDict):
         self.check_required_fields()
         self.check_conflicting_fields()
 
+        fields = self._FIELDS
         try:
             for field, value in self.items():
-                definitionfield = self.fields.get(field)
-                self[field] = definitionfield.convert(value)
-                definitionfield.check(self[field])
+                definitionfield = fields[field]
+                value = definitionfield.convert(value)
+                definitionfield.check(value)
+                self[field] = value
         except InvalidDefinitionError as e:
             self._raise(str(e))
 
+        # Every definition reads its source, so just keep it instead of caching it on access
+        self._source_field = self.get('source')
+
     def check_invalid_fields(self):
-        invalid = set(self.keys()) - set(self.fields.keys())
+        invalid = self.keys() - self._FIELDS.keys()
         if invalid:
             self._raise(f"invalid fields: '{','.join(invalid)}'")
 
     def check_required_fields(self):
-        required = set(f for f, v in self.fields.items() if v.default is None)
-        missing = required - set(self.keys())
+        missing = self._REQUIRED_FIELDS - self.keys()
         if missing:
             self._raise(f"required fields: '{','.join(missing)}'")
 
     def check_conflicting_fields(self):
+        if not self._FIELD_CONFLICTS:
+            return
         for field in self.keys():
-            for conflict in (self.fields.get(field).conflicts or []):
+            for conflict in self._FIELD_CONFLICTS.get(field, ()):
                 if conflict in self:
                     self._raise(f"conflicting fields: '{field}' and '{conflict}'")
 
@@ -226,8 +375,15 @@ class DefinitionSourceDefinition(Definition):
 
         Unlike Definition.source, this returns the source Definition instead of the
         'source' field value. If the source Definition is not found, this returns None.
+
+        Once found, the source Definition is cached; it is not cached while it is not found,
+        as it may be added to our reductions after us.
         '''
-        return self.reductions.get(super().source)
+        source = self.__dict__.get('_source_definition')
+        if source is None:
+            source = self.reductions.get(super().source)
+            self._source_definition = source
+        return source
 
     @property
     def source_class(self):
@@ -247,87 +403,3 @@ class DefinitionSourceDefinition(Definition):
             clsname = self.source.__class__.__name__
             classes = ' or '.join([c.__name__ for c in source_classes])
             self._raise(f'Source class is {clsname} but we require {classes}')
-
-
-class DefinitionField(object):
-    '''DefinitionField class.
-
-    The 'fieldtypes' should be set to a string for required type of
-    this field, or a list of possible types. The value must be one of
-    the FIELD_TYPES keys.
-
-    If 'fieldtypes' is set to only one of 'bool', 'int', 'text', or 'bytes',
-    the value will be coerced to that type. If 'list' is one of the
-    field types, the value will always be converted to a list.
-
-    If 'default' is set, it will be used if this field is not set,
-    and this field is considered optional; otherwise if 'default' is
-    not set, this field is required.
-
-    If 'conflicts' is set, it should be a list of field names this
-    field conflicts with.
-    '''
-    FIELD_CLASSES = [
-        bool,
-        bytes,
-        dict,
-        int,
-        list,
-        str,
-    ]
-
-    def __init__(self, fieldclasses, *, default=None, conflicts=None):
-        if not isinstance(fieldclasses, list):
-            fieldclasses = [fieldclasses]
-        for c in fieldclasses:
-            if c not in self.FIELD_CLASSES:
-                raise InvalidDefinitionError(f"Invalid field class '{c}'")
-        self.fieldclasses = set(fieldclasses)
-        self.default = default
-        self.conflicts = conflicts or []
-
-    @property
-    def fieldnames(self):
-        return [c.__name__ for c in self.fieldclasses]
-
-    def convert(self, value):
-        if value is None:
-            return None
-
-        if set([bool]) == self.fieldclasses:
-            with suppress(Exception):
-                value = str(value).strip().lower()
-                if value in ('true', 'yes', '1'):
-                    return True
-                if value in ('false', 'no', '0'):
-                    return False
-
-        if set([int]) == self.fieldclasses:
-            with suppress(Exception):
-                return int(value)
-
-        if set([str]) == self.fieldclasses:
-            if isinstance(value, bytes):
-                with suppress(Exception):
-                    return value.decode()
-            else:
-                with suppress(Exception):
-                    return str(value)
-
-        if set([bytes]) == self.fieldclasses:
-            if isinstance(value, str):
-                with suppress(Exception):
-                    return value.encode()
-            else:
-                with suppress(Exception):
-                    return bytes(value)
-
-        if list in self.fieldclasses:
-            if not isinstance(value, list):
-                value = [value]
-
-        return value
-
-    def check(self, value):
-        if not isinstance(value, tuple(self.fieldclasses) + (None,)):
-            raise InvalidDefinitionError(f"invalid {','.join(self.fieldnames)} field: '{value}'")
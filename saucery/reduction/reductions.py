@@ -1,10 +1,17 @@
 
+import hashlib
 import logging
+import marshal
+import os
+import threading
+import time
 import yaml
 
-from collections import ChainMap
-from collections import UserDict
+from collections.abc import MutableMapping
+from concurrent import futures
 from contextlib import suppress
+from functools import partial
+from itertools import chain
 from pathlib import Path
 
 from .. import json
@@ -12,19 +19,102 @@ from .. import json
 from .analysis import Analysis
 from .definition import InvalidDefinitionError
 from .definition import Definition
+from .definition import TRUE_STRINGS
 from .reference import Reference
 
 
 LOGGER = logging.Logger(__name__)
 
+# Use the much faster libyaml parser, if pyyaml was built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
-class Reductions(UserDict):
+# A new tree cache is written each time any reductions file changes, so only the most
+# recently used are kept
+TREE_CACHE_KEEP = 8
+# Any other cache file not used for this many seconds is removed
+CACHE_MAX_AGE = 30 * 24 * 60 * 60
+
+
+def cachedir():
+    '''The dir to cache parsed reduction files in.
+
+    This is under XDG_CACHE_HOME, which is ~/.cache by default.
+    '''
+    xdg_cache_home = os.getenv('XDG_CACHE_HOME', '~/.cache')
+    return Path(xdg_cache_home).expanduser().resolve() / 'saucery' / 'reductions'
+
+
+def cache_read(cache, key):
+    '''Read content from the cache file.
+
+    Returns None if the cache file can't be read, or if it was not written with the same key.
+    '''
+    try:
+        cachekey, content = marshal.loads(cache.read_bytes())
+    except (OSError, EOFError, TypeError, ValueError):
+        return None
+    if cachekey != key:
+        return None
+    # Mark it used, so cache_prune() keeps it
+    with suppress(OSError):
+        os.utime(cache)
+    return content
+
+
+def cache_write(cache, key, content):
+    '''Write content, with its key, to the cache file.
+
+    Content that marshal can't store (e.g. YAML timestamps) is not cached.
+    '''
+    try:
+        data = marshal.dumps((key, content))
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so no other thread or process reads a partial file
+        tmp = cache.with_name(f'{cache.name}.{os.getpid()}.{threading.get_ident()}')
+        tmp.write_bytes(data)
+        tmp.replace(cache)
+    except (OSError, ValueError):
+        LOGGER.debug(f'Could not write cache file {cache}')
+
+
+def cache_prune(directory):
+    '''Remove old cache files from the directory.
+
+    Only the TREE_CACHE_KEEP most recently used tree cache files are kept, and any other
+    cache file, e.g. for a reductions file that was moved or removed, is removed once it
+    has not been used for CACHE_MAX_AGE seconds.
+    '''
+    oldest = time.time() - CACHE_MAX_AGE
+    trees = []
+    remove = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    mtime = entry.stat().st_mtime
+                except OSError:
+                    continue
+                if entry.name.startswith('tree-'):
+                    trees.append((mtime, entry.path))
+                elif mtime < oldest:
+                    remove.append(entry.path)
+    except OSError:
+        return
+    trees.sort(reverse=True)
+    remove.extend(path for _, path in trees[TREE_CACHE_KEEP:])
+    for path in remove:
+        with suppress(OSError):
+            os.unlink(path)
+
+
+class Reductions(MutableMapping):
     def __init__(self, sos, location):
         super().__init__()
         self.sos = sos
         self._analyses = {}
         self._references = {}
-        self.data = ChainMap(self._references, self._analyses)
+        # All definitions, by name; names are unique across references and analyses
+        self._index = {}
         if not location:
             LOGGER.error('No location provided for Reductions')
         else:
@@ -44,6 +134,21 @@ class Reductions(UserDict):
     def reference(self, name):
         return self._references.get(name)
 
+    def __getitem__(self, key):
+        return self._index[key]
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def get(self, key, default=None):
+        return self._index.get(key, default)
+
     def __setitem__(self, key, value):
         if not value:
             raise ValueError('Delete key instead of setting value to None')
@@ -58,25 +163,172 @@ class Reductions(UserDict):
         else:
             raise InvalidDefinitionError(f'Unknown definition class: {value.__class__}')
         clsdict[key] = value
+        self._index[key] = value
 
     def __delitem__(self, key):
-        for d in [self._references, self._analyses]:
-            with suppress(KeyError):
+        del self._index[key]
+        for d in (self._references, self._analyses):
+            if key in d:
                 del d[key]
                 return
-        raise KeyError(key)
+
+    def precompute(self, references):
+        '''Compute the pathlist of each reference, and all their dependencies, in parallel.
+
+        References are computed in layers, each only after all its dependencies are computed,
+        so no reference is ever computed by more than one thread. If a reference fails, all
+        references depending on it are skipped. Failures aren't recorded, so the failed
+        reference, and those depending on it, are computed again (e.g. an exec reference's
+        program is run again) and fail again when used.
+
+        The number of threads is the 'reductions_threads' config, e.g. with
+        SAUCERY_REDUCTIONS_THREADS=4 in the environment; 0 (the default) uses the
+        ThreadPoolExecutor default. With 1 thread, nothing is precomputed, and each reference
+        is computed only when used.
+        '''
+        threads = int(self.sos.config.get('reductions_threads') or 0)
+        if threads == 1:
+            return
+
+        pending = {}
+        references = list(references)
+        while references:
+            reference = references.pop()
+            name = reference.get('name')
+            if name not in pending:
+                pending[name] = reference
+                references.extend(reference.dependencies)
+
+        done = set()
+        with futures.ThreadPoolExecutor(max_workers=threads or None) as executor:
+            while pending:
+                layer = {}
+                dropped = False
+                for name, reference in list(pending.items()):
+                    dependencies = [d.get('name') for d in reference.dependencies]
+                    if any(d not in pending and d not in done for d in dependencies):
+                        # A dependency failed
+                        del pending[name]
+                        dropped = True
+                    elif all(d in done for d in dependencies):
+                        layer[name] = executor.submit(getattr, reference, 'pathlist')
+                if not layer:
+                    if dropped:
+                        # Their dependents are dropped on the next pass
+                        continue
+                    LOGGER.error(f'Circular reference dependencies: {list(pending)}')
+                    return
+                for name, future in layer.items():
+                    del pending[name]
+                    if not future.exception():
+                        done.add(name)
 
     def _load(self, location):
-        for f in location.rglob('[!.]*.[jJ][sS][oO][nN]'):
-            self._load_json(f)
-        for f in location.rglob('[!.]*.[yY][aA][mM][lL]'):
-            self._load_yaml(f)
+        '''Load all definitions under the location.
+
+        The files are read and parsed in parallel, but the definitions are added in order
+        here, so they are added the same as if loaded serially.
+
+        Unless the 'reductions_nocache' config is true, e.g. with SAUCERY_REDUCTIONS_NOCACHE=1
+        in the environment, the parsed content of each file is cached, and the parsed content
+        of all the files is also cached together, keyed by every file's path, mtime, and size;
+        so if no file changed, only a single cache file is read. Old cache files are removed
+        whenever new ones are written; see cache_prune().
+        '''
+        files = {'json': [], 'yaml': []}
+        self._find_files(location, files)
+        nocache = str(self.sos.config.get('reductions_nocache') or '').strip().lower()
+        usecache = nocache not in TRUE_STRINGS
+
+        treecache = None
+        fingerprint = self._fingerprint(files) if usecache else None
+        if fingerprint:
+            treecache = cachedir() / f'tree-{fingerprint}'
+            parsed = cache_read(treecache, None)
+            if parsed is not None:
+                for definitions in parsed:
+                    self._add_definitions(definitions)
+                return
+
+        parse_json = partial(self._parse, parse=json.loads, usecache=usecache)
+        parse_yaml = partial(self._parse, parse=partial(yaml.load, Loader=YAML_LOADER),
+                             usecache=usecache)
+        parsed = []
+        with futures.ThreadPoolExecutor() as executor:
+            for definitions in chain(executor.map(parse_json, files['json']),
+                                     executor.map(parse_yaml, files['yaml'])):
+                self._add_definitions(definitions)
+                parsed.append(definitions)
+
+        if treecache:
+            cache_write(treecache, None, parsed)
+        if usecache:
+            cache_prune(cachedir())
+
+    @staticmethod
+    def _fingerprint(files):
+        '''The hash of every file's path, mtime, and size.
+
+        Returns None if any file can't be stat'ed, e.g. if it was removed after it was found;
+        then the tree cache is not used.
+        '''
+        h = hashlib.sha256()
+        for ext, paths in files.items():
+            for path in paths:
+                try:
+                    stat = path.stat()
+                except OSError:
+                    return None
+                h.update(f'{ext}:{path}:{stat.st_mtime_ns}:{stat.st_size}\n'.encode())
+        return h.hexdigest()
+
+    @classmethod
+    def _find_files(cls, directory, files):
+        '''Find all definition files under the directory.
+
+        This walks the directory tree once, appending each non-hidden file to the list in
+        'files' for its (case-insensitive) extension, if there is one. Files are found in
+        the same order as Path.rglob(), which also does not follow symlinked directories.
+        '''
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                        continue
+                    if entry.name.startswith('.'):
+                        continue
+                    _, dot, ext = entry.name.rpartition('.')
+                    if dot and ext.lower() in files:
+                        files[ext.lower()].append(Path(entry.path))
+        except OSError:
+            return
+        for subdir in subdirs:
+            cls._find_files(subdir, files)
 
-    def _load_json(self, path):
-        self._add_definitions(json.loads(path.read_text()))
+    @staticmethod
+    def _parse(path, *, parse, usecache=True):
+        '''Parse the file content, or get it from our cache.
 
-    def _load_yaml(self, path):
-        self._add_definitions(yaml.safe_load(path.read_text()))
+        If 'usecache' is True, the parsed content is cached, and used instead of parsing the
+        file again while the file's mtime and size are unchanged.
+        '''
+        if not usecache:
+            return parse(path.read_bytes())
+        stat = path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        cache = cachedir() / hashlib.sha256(bytes(path)).hexdigest()
+        content = cache_read(cache, key)
+        if content is None:
+            content = parse(path.read_bytes())
+            cache_write(cache, key, content)
+        return content
 
     def _add_definitions(self, definitions):
         if isinstance(definitions, list):
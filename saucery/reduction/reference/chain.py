@@ -1,6 +1,4 @@
 
-from copy import deepcopy
-
 from .reference import Reference
 
 
@@ -38,17 +36,21 @@ class ChainReference(Reference):
             self._raise('requires at least one chain entry')
         chain = []
         source = self.source
-        for definition in deepcopy(self.get('chain')):
+        for definition in self.get('chain'):
             for field in ['name', 'source']:
                 if field in definition:
                     self._raise(f"entries must not include '{field}'")
 
-            definition['source'] = source
-            reference = self.anonymous(definition)
+            # Our definitions never modify their field values, so a shallow copy is enough
+            reference = self.anonymous({**definition, 'source': source})
             chain.append(reference)
             source = reference.get('name')
         return chain
 
+    @property
+    def dependencies(self):
+        return [self._chain[-1]]
+
     @property
     def pathlist(self):
         return self._chain[-1].pathlist
@@ -1,21 +1,78 @@
 
 import configparser
+import weakref
 
 from collections import ChainMap
-from collections import UserDict
-from functools import cached_property
+from contextlib import suppress
+
+from ...functools import cached_property
 
 from .parse import DictReference
 from .parse import ParseReference
 from .path import ReferencePathDict
 
 
+class FastIniParseError(Exception):
+    pass
+
+
+class FastIniParser(dict):
+    '''FastIniParser class.
+
+    This parses simple INI content, with the same result as ConfigParser but much faster.
+
+    Simple content has only section headers, comments, empty lines, and single-line options;
+    any other content, including multi-line values and anything ConfigParser would reject,
+    raises FastIniParseError, and must be parsed by ConfigParser instead.
+
+    The parsed content is kept as a dict of each section name to a dict of its options.
+    '''
+    COMMENT_PREFIXES = ('#', ';')
+    DELIMITERS = ('=', ':')
+
+    def read_lines(self, lines, *, section_hook, option_hook):
+        '''Parse the lines.
+
+        The 'section_hook' is called with each section name, and the 'option_hook' is called
+        with each section name and option key, as each is parsed.
+
+        Section headers and options are found with str methods, with the same result as the
+        ConfigParser SECTCRE and OPTCRE regexes, as their delimiters are all literals.
+        '''
+        section = None
+        for line in lines:
+            value = line.strip()
+            if not value or value.startswith(self.COMMENT_PREFIXES):
+                continue
+            if line[:1].isspace():
+                # This might be a continuation of the previous option's value
+                raise FastIniParseError(f'Indented line: {line}')
+            if value[0] == '[':
+                # The header is up to the last ']', but must not be empty
+                end = value.rfind(']')
+                if end > 1:
+                    section = value[1:end]
+                    self.setdefault(section, {})
+                    section_hook(section)
+                    continue
+            index = min((i for i in map(value.find, self.DELIMITERS) if i != -1), default=-1)
+            key = value[:index].rstrip().lower()
+            if section is None or index == -1 or not key:
+                raise FastIniParseError(f'Invalid line: {line}')
+            self[section][key] = value[index + 1:].strip()
+            option_hook(section, key)
+
+
 class IniReference(ParseReference):
     '''IniReference class.
 
     This parses its source value as a INI file, which should be in the default format
     accepted by the python ConfigParser class.
 
+    Simple content is parsed by the much faster FastIniParser, and only other content
+    is parsed by ConfigParser; if the 'strict_ini' field is True, all content is parsed
+    by ConfigParser.
+
     Note that this does not modify the provided ReferencePathList; the parsed content
     must be accessed using the 'sections' attribute, which returns a dict containing
     key-value pairs; the keys are all parsed section names and each maps to a IniSection
@@ -23,6 +80,11 @@ class IniReference(ParseReference):
     '''
     NO_DEFAULT_SECTION = '_SAUCERY_NO_DEFAULT_SECTION_'
 
+    # Parsed sections, by source pathlist and then by line iterator and strict_ini; so
+    # references that parse the same source the same way, e.g. one inisection reference per
+    # section of a file, only parse it once
+    _PARSED_SECTIONS = weakref.WeakKeyDictionary()
+
     @classmethod
     def TYPE(cls):
         return 'ini'
@@ -31,12 +93,14 @@ class IniReference(ParseReference):
     def _add_fields(cls):
         return {
             'default_section': str,
+            'strict_ini': bool,
         }
 
     @classmethod
     def _field_defaults(cls):
         return {
             'default_section': configparser.DEFAULTSECT,
+            'strict_ini': False,
         }
 
     def setup(self):
@@ -71,24 +135,58 @@ class IniReference(ParseReference):
         self._section = None
 
     def parse(self, pathlist):
+        parsed = self._PARSED_SECTIONS.setdefault(pathlist, {})
+        # strict_ini changes which parser is used, so its result is kept separately
+        key = (type(self)._line_iterator, self.get('strict_ini'))
+        sections = parsed.get(key)
+        if sections is None:
+            self._parse_sections(pathlist)
+            parsed[key] = self._sections
+        else:
+            self._sections = sections
+        return pathlist
+
+    def _parse_sections(self, pathlist):
+        if not self.get('strict_ini'):
+            with suppress(FastIniParseError):
+                self._fast_parse_sections(pathlist)
+                return
+            self._line = None
+            self._section = None
+            self._sections = {}
+        self._configparser_parse_sections(pathlist)
+
+    def _fast_parse_sections(self, pathlist):
+        parser = FastIniParser()
+
+        def section_hook(name):
+            if name not in self._sections:
+                self._sections[name] = IniSection(parser, name)
+            self._section = self._sections[name]
+
+        def option_hook(name, key):
+            self._section[key] = IniOption(self._section, key, self._line)
+
+        parser.read_lines(self._line_iterator(pathlist.line_iterator),
+                          section_hook=section_hook, option_hook=option_hook)
+
+    def _configparser_parse_sections(self, pathlist):
         parser = None
 
+        # Only setting a section or option needs tracking; each section dict keeps its own
+        # IniSection, so no hook is needed on the (much more frequent) dict reads
         class dictcls(dict):
-            def __getitem__(innerself, key):
-                value = super().__getitem__(key)
-                if self._line and isinstance(value, innerself.__class__):
-                    self._section = self._sections[key]
-                return value
-
             def __setitem__(innerself, key, value):
                 super().__setitem__(key, value)
                 if not self._line:
                     return
                 if isinstance(value, innerself.__class__):
-                    self._sections[key] = IniSection(parser, key)
-                    self._section = self._sections[key]
+                    value._inisection = IniSection(parser, key)
+                    self._sections[key] = value._inisection
                 elif isinstance(value, list) or value is None:
-                    self._section[key] = IniOption(self._section, key, self._line)
+                    section = getattr(innerself, '_inisection', None)
+                    if section is not None:
+                        section[key] = IniOption(section, key, self._line)
 
         # We need to use a fake default_section name, so we can detect the real default section
         parser = configparser.ConfigParser(default_section=self.NO_DEFAULT_SECTION,
@@ -96,8 +194,6 @@ class IniReference(ParseReference):
                                            interpolation=None)
         parser.read_file(self._line_iterator(pathlist.line_iterator), self.get('name'))
 
-        return pathlist
-
 
 class IniSectionReference(IniReference, DictReference):
     '''IniSectionReference class.
@@ -156,7 +252,7 @@ class KeyValueDictReference(IniSectionReference):
         yield from super()._line_iterator(lines)
 
 
-class IniSection(UserDict):
+class IniSection(dict):
     def __init__(self, parser, name):
         super().__init__()
         self._parser = parser
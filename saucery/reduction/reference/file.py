@@ -1,7 +1,5 @@
 
-from itertools import chain
-from functools import cached_property
-from pathlib import Path
+from ...functools import cached_property
 
 from .path import ReferencePathList
 from .reference import Reference
@@ -42,11 +40,12 @@ class FileReference(Reference):
 
     @cached_property
     def pathlist(self):
+        sources = self.source
         if self.get('noglob'):
-            sources = [self.file(s) for s in self.source]
+            paths = map(self.file, sources)
         else:
-            sources = list(chain(*(self.fileglob(s) for s in self.source)))
-        return ReferencePathList([s for s in sources if s], sos=self.sos)
+            paths = (p for s in sources for p in self.fileglob(s))
+        return ReferencePathList([p for p in paths if p], sos=self.sos)
 
     def _convert_source(self, source):
         return source
@@ -55,7 +54,15 @@ class FileReference(Reference):
         return self.sos.file(self._convert_source(source))
 
     def fileglob(self, source):
-        return sorted(self.sos.fileglob(self._convert_source(source)) or [])
+        return self._sorted(self.sos.fileglob(self._convert_source(source)))
+
+    @staticmethod
+    def _sorted(paths):
+        '''Sort the new list of glob matches in place, or return [] if None.'''
+        if not paths:
+            return []
+        paths.sort()
+        return paths
 
 
 class SubdirFileReference(FileReference):
@@ -79,8 +86,13 @@ class SubdirFileReference(FileReference):
             'subdir': str,
         }
 
+    @cached_property
+    def _subdir_prefix(self):
+        return self.get('subdir').rstrip('/') + '/'
+
     def _convert_source(self, source):
-        return str(Path(self.get('subdir')) / source.lstrip('/'))
+        # The sos normalizes this path, so just join the strings
+        return self._subdir_prefix + source.lstrip('/')
 
 
 class CommandReference(FileReference):
@@ -104,10 +116,14 @@ class CommandReference(FileReference):
             'command': str,
         }
 
+    @cached_property
+    def _command(self):
+        return self.get('command')
+
     def file(self, source):
         return self.sos.file(self._convert_source(source),
-                             command=self.get('command'))
+                             command=self._command)
 
     def fileglob(self, source):
-        return sorted(self.sos.fileglob(self._convert_source(source),
-                                        command=self.get('command')) or [])
+        return self._sorted(self.sos.fileglob(self._convert_source(source),
+                                              command=self._command))
@@ -1,17 +1,29 @@
 
 import json
 import subprocess
+import tempfile
 import yaml
 
 from abc import abstractmethod
-from functools import cached_property
+from functools import cache
 from shutil import which
 
+from ...functools import cached_property
+
 from .path import ReferencePathDict
 from .path import ReferencePathList
 from .reference import ReferenceSourceReference
 
 
+@cache
+def find_command(name):
+    '''The full path to the named command, or None if it isn't found.
+
+    This searches our PATH only once for each command, not once for each reference using it.
+    '''
+    return which(name)
+
+
 class ParseReference(ReferenceSourceReference):
     '''ParseReference class.
 
@@ -64,7 +76,7 @@ class TransformReference(ParseReference):
     def transform(self, value):
         '''Transform the value.
 
-        Subclasses must implement this. The return value must be bytes, or None.
+        Subclasses must implement this. The return value must be bytes, str, or None.
 
         This will only be called once, and the returned value cached.
 
@@ -72,6 +84,20 @@ class TransformReference(ParseReference):
         '''
         pass
 
+    def transform_to(self, value, file):
+        '''Transform the value, writing it to the file.
+
+        Returns True if the value was transformed, or False if the transformed value is None.
+
+        By default, this writes the value returned by transform(); subclasses that can write
+        directly to the file should override this.
+        '''
+        value = self.transform(value)
+        if value is None:
+            return False
+        file.write(value.encode() if isinstance(value, str) else value)
+        return True
+
     def parse(self, pathlist):
         value = pathlist.value if pathlist else None
         if not self.parse_none_value and value is None:
@@ -79,7 +105,14 @@ class TransformReference(ParseReference):
 
         name = self.get('name')
 
-        self.sos.analysis_files[name] = self.transform(value)
+        transformed = False
+        try:
+            with self.sos.analysis_files.open(name, 'wb') as f:
+                transformed = self.transform_to(value, f)
+        finally:
+            # Don't leave behind an empty or partial file
+            if not transformed:
+                del self.sos.analysis_files[name]
 
         return ReferencePathList([self.sos.analysis_files.path(name)], sos=self.sos)
 
@@ -131,18 +164,25 @@ class ExecReference(TransformReference):
     @cached_property
     def exec_cmd(self):
         cmdname = self.get('exec')
-        cmd = which(cmdname)
+        cmd = find_command(cmdname)
         if not cmd:
             self._raise(f"Could not find '{cmdname}' command")
         return [cmd] + self.sos.mapping.format(self.get('params'))
 
     def transform(self, value):
+        # parse() uses transform_to(), so this is only for callers wanting the value itself
+        with tempfile.TemporaryFile() as f:
+            if not self.transform_to(value, f):
+                return None
+            f.seek(0)
+            return f.read()
+
+    def transform_to(self, value, file):
+        # The program writes its output directly to the file, so we never read it into memory
         result = subprocess.run(self.exec_cmd, input=value,
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.PIPE)
-        if result.returncode != 0:
-            return None
-        return result.stdout
+                                stdout=file,
+                                stderr=subprocess.DEVNULL)
+        return result.returncode == 0
 
 
 class JqReference(ExecReference):
@@ -172,7 +212,7 @@ class JqReference(ExecReference):
             'exec': 'jq',
         }
 
-    @property
+    @cached_property
     def exec_cmd(self):
         return super().exec_cmd + [self.get('jq')]
 
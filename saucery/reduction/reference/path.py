@@ -3,12 +3,14 @@ import logging
 import re
 import sys
 
+from bisect import bisect_left
+from bisect import bisect_right
 from collections.abc import Collection
 from collections.abc import Mapping
 from contextlib import suppress
-from functools import cached_property
 from pathlib import Path
 
+from ...functools import cached_property
 from ...lines import PathLineOffsets
 
 
@@ -29,24 +31,28 @@ class ReferencePath(type(Path())):
         self._length = max(0, length)
 
         self._ref = args[0] if args and isinstance(args[0], ReferencePath) else None
+        # The ReferencePath that actually reads the file, which all our slices take their
+        # value from
+        self._rootpath = self._ref._rootpath if self._ref else self
 
-        if not self._ref and not self._sos:
-            raise ValueError('ReferencePath requires SOS')
-
-        # Raise ValueError if not inside our sos
-        self.sospath
+        if not self._ref:
+            if not self._sos:
+                raise ValueError('ReferencePath requires SOS')
+            # Raise ValueError if not inside our sos; a slice of a ReferencePath is the same
+            # path, so this only needs checking once, not again for each line or match slice
+            self.sospath
 
         return self
 
     @property
     def sos(self):
-        return self._sos or self._ref._sos
+        return self._sos or self._ref.sos
 
     @property
     def sospath(self):
         return self.relative_to(self.sos.workdir)
 
-    @property
+    @cached_property
     def offset(self):
         if self._ref:
             return self._ref.offset + self._offset
@@ -95,12 +101,21 @@ class ReferencePath(type(Path())):
         '''Iterate over our value, line-by-line.
 
         This returns an iterable of ReferencePath objects, which each represent a line.
+
+        Only lines inside our range are included; if our range ends partway through a line,
+        the final line ends at the end of our range.
         '''
         offsets = self._path_line_offsets.line_offsets
         if offsets is None:
             return
 
-        offsets = [o - self.offset for o in offsets if o > self.offset]
+        # The offsets are sorted, so find the lines inside our range without checking them all
+        start = self.offset
+        end = start + self.length
+        offsets = [o - start for o in offsets[bisect_right(offsets, start):
+                                              bisect_left(offsets, end)]]
+        if self.length:
+            offsets.append(self.length)
         if not offsets:
             return
 
@@ -116,24 +131,41 @@ class ReferencePath(type(Path())):
         section of our value that matches the regex pattern.
 
         This will *not* include any 'null' (0-length) matches.
+
+        The pattern may also be an already-compiled bytes pattern object, from any module
+        providing a compatible finditer() method; in that case the flags are ignored.
         '''
         if pattern is None:
             return
-        if isinstance(pattern, str):
-            pattern = pattern.encode(errors='replace')
-        if not isinstance(pattern, bytes):
-            raise ValueError(f'Requires str or bytes, not {type(pattern)}')
-        for match in re.finditer(pattern, self.value, flags=flags):
+        pattern = self.compile_pattern(pattern, flags=flags)
+        for match in pattern.finditer(self.value):
             matchlen = match.end() - match.start()
             if not matchlen:
                 continue
             yield ReferencePath(self, offset=match.start(), length=matchlen)
 
+    @staticmethod
+    def compile_pattern(pattern, flags=0):
+        '''Compile the str or bytes pattern into a bytes pattern object.
+
+        An already-compiled pattern is returned unchanged, and the flags are ignored.
+        '''
+        if isinstance(pattern, str):
+            pattern = pattern.encode(errors='replace')
+        if isinstance(pattern, bytes):
+            pattern = re.compile(pattern, flags=flags)
+        if not hasattr(pattern, 'finditer'):
+            raise ValueError(f'Requires str, bytes, or compiled pattern, not {type(pattern)}')
+        return pattern
+
     @cached_property
     def _value(self):
         with suppress(OSError):
+            # Unbuffered, as we read it all at once; and most reads are of an entire file,
+            # so only seek if needed
             with self.open(mode='rb', buffering=0) as f:
-                f.seek(self.offset)
+                if self.offset:
+                    f.seek(self.offset)
                 return f.read(self._length or None)
         return None
 
@@ -147,9 +179,9 @@ class ReferencePath(type(Path())):
         On error, return None.
         '''
         if self._ref:
-            offset = self.offset - self._ref.offset
-            end_offset = offset + self.length
-            return self._ref.value[offset:end_offset]
+            # Slice the root value directly, instead of each intermediate slice's value
+            offset = self.offset - self._rootpath.offset
+            return self._rootpath._value[offset:offset + self.length]
         return self._value
 
 
@@ -195,9 +227,14 @@ class ReferencePathList(Collection):
         section of our value that matches the regex pattern.
 
         This will *not* include any 'null' (0-length) matches.
+
+        The pattern is compiled only once here, instead of again for each of our paths.
         '''
+        if pattern is None:
+            return
+        pattern = ReferencePath.compile_pattern(pattern, flags=flags)
         for referencepath in self._paths:
-            yield from referencepath.regex_iterator(pattern, flags=flags)
+            yield from referencepath.regex_iterator(pattern)
 
     def regex_pathlist(self, pattern, flags=0):
         '''ReferencePathList of each match of our value for the pattern.
@@ -206,7 +243,7 @@ class ReferencePathList(Collection):
         '''
         return ReferencePathList(self.regex_iterator(pattern, flags=flags))
 
-    @property
+    @cached_property
     def value(self):
         '''The concatenated value of all ReferencePath objects.
 
@@ -215,12 +252,36 @@ class ReferencePathList(Collection):
         If we have at least one object and all our objects' value is None, return None.
 
         Otherwise, return the concatenated value of all our objects' value as bytes.
+
+        Our paths don't change, so this is only concatenated once.
         '''
-        values = [p.value for p in self._paths if p.value is not None]
+        values = [v for v in self._values() if v is not None]
         if not values and self._paths:
             return None
         return b''.join(values)
 
+    def _values(self):
+        '''Iterate over the values of our objects.
+
+        Consecutive objects that are adjacent slices of the same root file value, e.g. a run
+        of lines or a whole file's line_iterator, are yielded as a single slice of the root
+        value, instead of copying each out separately only to join them back together.
+        '''
+        root = start = end = None
+        for path in self._paths:
+            if path._ref and path._rootpath is root and path.offset == end:
+                end += path.length
+                continue
+            if root is not None:
+                yield root._value[start - root.offset:end - root.offset]
+                root = None
+            if path._ref and path._rootpath._value is not None:
+                root, start, end = path._rootpath, path.offset, path.offset + path.length
+            else:
+                yield path.value
+        if root is not None:
+            yield root._value[start - root.offset:end - root.offset]
+
     def _slice(self, offset, length):
         length = length or sys.maxsize
         for referencepath in self._paths:
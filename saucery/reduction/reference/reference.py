@@ -36,6 +36,14 @@ class Reference(Definition):
         '''
         return self.pathlist.value
 
+    @property
+    def dependencies(self):
+        '''The references our pathlist is computed from.
+
+        Returns a list of Reference objects. By default, this is empty.
+        '''
+        return []
+
 
 class ReferenceSourceDefinition(DefinitionSourceDefinition):
     '''ReferenceSourceDefinition class.
@@ -59,8 +67,24 @@ class ReferenceSourceDefinition(DefinitionSourceDefinition):
         '''The source.value.
 
         Returns None if our source is None, otherwise returns source.value.
+
+        Once we have a source, its value is cached.
         '''
-        return self.source.value if self.source else None
+        source = self.source
+        if not source:
+            return None
+        if '_source_value' not in self.__dict__:
+            self._source_value = source.value
+        return self._source_value
+
+    @property
+    def source_pathdict(self):
+        '''The source.pathdict.
+
+        Returns None if our source is None or has no pathdict, otherwise returns
+        source.pathdict.
+        '''
+        return getattr(self.source, 'pathdict', None)
 
 
 class ReferenceSourceReference(Reference, ReferenceSourceDefinition):
@@ -68,4 +92,6 @@ class ReferenceSourceReference(Reference, ReferenceSourceDefinition):
 
     This represents a reference, where the 'source' is a Reference.
     '''
-    pass
+    @property
+    def dependencies(self):
+        return [self.source] if self.source else []
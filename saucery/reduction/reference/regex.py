@@ -1,7 +1,82 @@
 
+import importlib
+import logging
 import re
 
+from functools import cache
+
+# These are private modules that may change between python versions; without them,
+# regex_literal() always returns None, so patterns are matched without a prefilter
+try:
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:
+    try:
+        # python < 3.11
+        import sre_constants
+        import sre_parse
+    except ImportError:
+        sre_constants = sre_parse = None
+
+from ...functools import cached_property
+
 from .parse import ParseReference
+from .path import ReferencePathList
+
+
+LOGGER = logging.getLogger(__name__)
+
+INLINE_FLAGS = {
+    re.IGNORECASE: 'i',
+    re.MULTILINE: 'm',
+}
+
+
+@cache
+def regex_module(name=None):
+    '''The module to use for regex matching.
+
+    By default this is the python 're' module. The name of any module with a compatible
+    compile() function may be used instead, for example 'regex' or 're2'; the 're2' module
+    guarantees linear-time matching, which avoids catastrophic backtracking on bad patterns,
+    but it does not support all 're' syntax (e.g. backreferences and lookaround).
+
+    If the module can't be imported, this logs a warning and returns the 're' module.
+    '''
+    if not name or name == 're':
+        return re
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        LOGGER.warning(f"Could not import regex module '{name}', using 're' instead")
+        return re
+
+
+def regex_literal(pattern):
+    '''The longest literal that every match of the bytes pattern must contain.
+
+    This only looks at the top level of the pattern, so e.g. literals inside groups or
+    alternations are ignored. Returns None if there is no such literal, if the pattern
+    is case-insensitive, or if the 're' module can't parse the pattern.
+
+    The pattern is parsed as an 're' pattern, so this is only valid for 're' matching. The
+    're' parser is private, so this also returns None if it is unavailable or has changed.
+    '''
+    if sre_parse is None:
+        return None
+    try:
+        parsed = sre_parse.parse(pattern)
+        if parsed.state.flags & re.IGNORECASE:
+            return None
+        literals = [b'']
+        for op, arg in parsed:
+            if op == sre_constants.LITERAL:
+                literals[-1] += bytes([arg])
+            else:
+                literals.append(b'')
+    except (re.error, AttributeError, TypeError, ValueError):
+        return None
+    return max(literals, key=len) or None
 
 
 class RegexReference(ParseReference):
@@ -13,6 +88,9 @@ class RegexReference(ParseReference):
     The 'multiline' field sets the regex MULTILINE mode. It is True by default.
 
     The 'ignorecase' field sets the regex IGNORECASE mode. It is False by default.
+
+    The regex module used for matching may be changed with the 'regex' config, e.g.
+    by setting SAUCERY_REGEX=re2 in the environment; see regex_module() for details.
     '''
     @classmethod
     def TYPE(cls):
@@ -46,5 +124,38 @@ class RegexReference(ParseReference):
             flags |= re.IGNORECASE
         return flags
 
+    @cached_property
+    def _inline_pattern(self):
+        '''Our pattern, with our flags prepended as inline flags.
+
+        Not all regex modules accept the 're' module flags parameter.
+        '''
+        flags = ''.join(f for flag, f in INLINE_FLAGS.items() if self._flags & flag)
+        pattern = self._pattern
+        if flags:
+            pattern = f'(?{flags})'.encode() + pattern
+        return pattern
+
+    @cached_property
+    def _regex_module(self):
+        return regex_module(self.sos.config.get('regex'))
+
+    @cached_property
+    def _regex(self):
+        return self._regex_module.compile(self._inline_pattern)
+
+    @cached_property
+    def _literal(self):
+        # Other regex modules don't parse all patterns the same as 're', e.g. 'regex' and
+        # 're2' accept POSIX classes like [[:digit:]], so only 're' patterns are prefiltered
+        if self._regex_module is not re:
+            return None
+        return regex_literal(self._inline_pattern)
+
     def parse(self, pathlist):
-        return pathlist.regex_pathlist(self._pattern, self._flags)
+        # Searching for a literal is much faster than running the regex, so skip any
+        # path that can't possibly match
+        if self._literal:
+            pathlist = ReferencePathList([p for p in pathlist
+                                          if p.value is not None and self._literal in p.value])
+        return pathlist.regex_pathlist(self._regex)
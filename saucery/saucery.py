@@ -5,8 +5,8 @@ import os
 
 from collections import ChainMap
 from contextlib import suppress
+from functools import cache
 from functools import cached_property
-from functools import lru_cache
 from functools import singledispatchmethod
 from pathlib import Path
 
@@ -108,7 +108,7 @@ class Saucery(SauceryBase):
 
         return self._sos(path)
 
-    @lru_cache(maxsize=None)
+    @cache
     def _sos(self, path):
         return SOS(instance=self, sosreport=path)
 
@@ -4,6 +4,9 @@ import subprocess
 
 from functools import cached_property
 
+from ..reduction.analysis import Analysis
+from ..reduction.reference import Reference
+
 
 LOGGER = logging.getLogger(__name__)
 
@@ -31,9 +34,29 @@ class SOSAnalysis(object):
         if not self.sos.customer:
             LOGGER.debug(f'Detecting customer: {self.name}')
             self.customer
+        self.run_references()
         LOGGER.debug(f'Gathering conclusions: {self.name}')
         self.conclusions
 
+    @property
+    def references(self):
+        '''The references our analyses use directly.'''
+        return [a.source for a in self.analyses if isinstance(a.source, Reference)]
+
+    def run_references(self):
+        '''Compute our references in parallel.
+
+        Many references are independent of each other, and many wait on file reads or
+        external programs, so instead of each being computed in turn when an analysis first
+        needs it, they are all computed together first. Any failure is ignored here, and
+        happens again when an analysis needs the reference.
+
+        Only the references are computed in parallel; the analyses themselves still run
+        one at a time, on this thread, after all the references are computed.
+        '''
+        LOGGER.debug(f'Computing references: {self.name}')
+        self.sos.reductions.precompute(self.references)
+
     def _get_conclusion(self, analysis):
         analysis_name = analysis.get('name')
         LOGGER.debug(f'Getting conclusion for {analysis_name}: {self.name}')
@@ -43,9 +66,26 @@ class SOSAnalysis(object):
             LOGGER.exception(f'Analysis {analysis_name} failed, skipping')
             return None
 
+    @cached_property
+    def analyses(self):
+        '''The analyses to get conclusions for.
+
+        If the 'level' config is set, e.g. with SAUCERY_LEVEL=warning in the environment,
+        any analysis with a lower level is skipped, so its analysis is never performed.
+        '''
+        analyses = self.sos.reductions.analyses
+        level = (self.sos.config.get('level') or '').lower()
+        if not level:
+            return analyses
+        if level not in Analysis.VALID_LEVELS:
+            LOGGER.error(f"Invalid level '{level}', not skipping any analyses: {self.name}")
+            return analyses
+        levels = Analysis.VALID_LEVELS[:Analysis.VALID_LEVELS.index(level) + 1]
+        return [a for a in analyses if a.level in levels]
+
     @cached_property
     def conclusions(self):
-        return [c for c in map(self._get_conclusion, self.sos.reductions.analyses) if c]
+        return [c for c in map(self._get_conclusion, self.analyses) if c]
 
     @cached_property
     def case(self):
@@ -107,6 +107,12 @@ class DirDict(MutableMapping):
     def path(self, key):
         return self._dirpath / key
 
+    def open(self, key, mode='rb'):
+        '''Open the file for key, e.g. to write a large value without holding it in memory.'''
+        if any(c in mode for c in 'wax+'):
+            self._dirpath.mkdir(exist_ok=True)
+        return self.path(key).open(mode)
+
     def __getitem__(self, key):
         try:
             return self.path(key).read_bytes()
@@ -104,9 +104,15 @@ class SOS(SauceryBase):
     def analysis_files(self):
         return DirDict(self.workdir / 'analysis_files')
 
+    @cached_property
+    def _filesdir_resolved(self):
+        # Our filesdir is a plain dir (or mountpoint) that we create, never a symlink, so this
+        # doesn't change once resolved
+        return self.filesdir.resolve()
+
     def under_filesdir(self, path):
         try:
-            Path(path).resolve().relative_to(self.filesdir.resolve())
+            Path(path).resolve().relative_to(self._filesdir_resolved)
             return True
         except ValueError:
             return False
@@ -0,0 +1,619 @@
+
+import configparser
+import os
+import re
+import shutil
+import sys
+import tempfile
+import unittest
+import warnings
+
+from pathlib import Path
+from saucery import Saucery
+from saucery.lines import PathLineOffsets
+from saucery.reduction import reductions
+from saucery.reduction.definition import Definition
+from saucery.reduction.definition import DefinitionField
+from saucery.reduction.definition import InvalidDefinitionError
+from saucery.reduction.reference.dict import FastIniParseError
+from saucery.reduction.reference.dict import FastIniParser
+from saucery.reduction.reference.dict import IniReference
+from saucery.reduction.reference.path import ReferencePath
+from saucery.reduction.reference.path import ReferencePathList
+from saucery.reduction.reference import regex
+from saucery.reduction.reference.regex import regex_literal
+from saucery.reduction.reference.regex import regex_module
+from saucery.sos.analyse import SOSAnalysis
+from saucery.sos.persistent import DirDict
+from types import SimpleNamespace
+from unittest import mock
+
+
+TEST_DATA_PATH = Path(__file__).parent / 'saucery_data'
+TEST_SOS = 'sosreport-sosreport-f-123456-2022-05-23-qcpndam.tar.xz'
+
+SIMPLE_INI = '''
+# comment
+; other comment
+[first]
+key = value
+Upper: Case
+delims = a=b:c
+inline = value # not a comment
+
+[second]
+empty =
+[first]
+key = again
+'''
+
+MULTILINE_INI = '''
+[first]
+key = one
+  two
+'''
+
+
+class ReductionTestCase(unittest.TestCase):
+    '''Base class for testing reductions against files in a sosreport.
+
+    The sosreport isn't extracted; the FILES are written directly into its filesdir.
+    '''
+    REDUCTIONS = '[]'
+    FILES = {}
+
+    def setUp(self):
+        self.testdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.testdir.cleanup)
+        self.testpath = Path(self.testdir.name)
+        # Keep the reductions cache out of the user's cache dir
+        environ = mock.patch.dict(os.environ, {'XDG_CACHE_HOME': str(self.testpath / 'cache')})
+        environ.start()
+        self.addCleanup(environ.stop)
+        shutil.copytree(TEST_DATA_PATH, self.testpath / 'saucery')
+        self.reductionsdir = self.testpath / 'reductions'
+        self.reductionsdir.mkdir()
+        (self.reductionsdir / 'test.yaml').write_text(self.REDUCTIONS)
+
+    def sosreport(self, **config):
+        saucery = Saucery(saucery=self.testpath / 'saucery', reductions=self.reductionsdir,
+                          **config)
+        sos = saucery.sosreport(TEST_SOS)
+        for name, content in self.FILES.items():
+            path = sos.filesdir / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+        return sos
+
+    @property
+    def sos(self):
+        if not hasattr(self, '_sos'):
+            self._sos = self.sosreport()
+        return self._sos
+
+    def reference(self, name):
+        return self.sos.reductions.reference(name)
+
+
+class FastIniParserTest(unittest.TestCase):
+    def fast_sections(self, content):
+        parser = FastIniParser()
+        parser.read_lines(content.splitlines(keepends=True),
+                          section_hook=lambda name: None,
+                          option_hook=lambda name, key: None)
+        return dict(parser)
+
+    def configparser_sections(self, content):
+        parser = configparser.ConfigParser(default_section=IniReference.NO_DEFAULT_SECTION,
+                                           strict=False, interpolation=None)
+        parser.read_string(content)
+        return {name: dict(parser[name]) for name in parser.sections()}
+
+    def testSameAsConfigParser(self):
+        for content in [SIMPLE_INI,
+                        '[a]\nx=1\n',
+                        '[a]b]\nx = 1\n',
+                        '[ spaced ]\nx = 1 \n',
+                        '[DEFAULT]\nx = 1\n[other]\ny = 2\n']:
+            with self.subTest(content=content):
+                self.assertEqual(self.fast_sections(content),
+                                 self.configparser_sections(content))
+
+    def testRejected(self):
+        for content in [MULTILINE_INI,
+                        'x = 1\n',
+                        '[a]\nnovalue\n',
+                        '[a]\n= value\n',
+                        '[]\nx = 1\n']:
+            with self.subTest(content=content):
+                with self.assertRaises(FastIniParseError):
+                    self.fast_sections(content)
+
+
+class IniReferenceTest(ReductionTestCase):
+    REDUCTIONS = '''
+- {name: simple, type: file, source: etc/simple.ini}
+- {name: simple_a, type: ini, source: simple}
+- {name: simple_b, type: ini, source: simple}
+- {name: simple_strict, type: ini, source: simple, strict_ini: true}
+- {name: multiline, type: file, source: etc/multiline.ini}
+- {name: multiline_fast, type: ini, source: multiline}
+- {name: multiline_strict, type: ini, source: multiline, strict_ini: true}
+'''
+    FILES = {
+        'etc/simple.ini': SIMPLE_INI,
+        'etc/multiline.ini': MULTILINE_INI,
+    }
+
+    def values(self, name):
+        return {section: {key: option.value for key, option in options.items()}
+                for section, options in self.reference(name).sections.items()}
+
+    def parser(self, name):
+        return next(iter(self.reference(name).sections.values()))._parser
+
+    def testSharedSections(self):
+        self.assertIs(self.reference('simple_a').sections, self.reference('simple_b').sections)
+        self.assertEqual(self.reference('simple_a').sections['first']['key'].value, 'again')
+
+    def testSameValues(self):
+        self.assertEqual(self.values('simple_a'), self.values('simple_strict'))
+        self.assertEqual(self.values('multiline_fast'), self.values('multiline_strict'))
+        self.assertEqual(self.values('multiline_fast')['first']['key'], 'one\ntwo')
+
+    def testFastParser(self):
+        self.assertIsInstance(self.parser('simple_a'), FastIniParser)
+        self.assertIsInstance(self.parser('multiline_fast'), configparser.ConfigParser)
+
+    def testStrictAfterFast(self):
+        self.assertIsInstance(self.parser('simple_a'), FastIniParser)
+        self.assertIsInstance(self.parser('simple_strict'), configparser.ConfigParser)
+
+    def testFastAfterStrict(self):
+        self.assertIsInstance(self.parser('simple_strict'), configparser.ConfigParser)
+        self.assertIsInstance(self.parser('simple_a'), FastIniParser)
+
+
+class PrecomputeTest(ReductionTestCase):
+    REDUCTIONS = '''
+- {name: bad, type: file, source: etc/bad.yaml}
+- {name: x, type: yaml2json, source: bad}
+- {name: y, type: splitlines, source: x}
+- {name: z, type: splitlines, source: y}
+- {name: w, type: file, source: etc/hostname}
+- {name: circular_a, type: splitlines, source: circular_b}
+- {name: circular_b, type: splitlines, source: circular_a}
+'''
+    FILES = {
+        'etc/bad.yaml': 'a: [b\n',
+        'etc/hostname': 'host\n',
+    }
+
+    def precompute(self, *names, sos=None):
+        sos = sos or self.sos
+        with mock.patch.object(reductions.LOGGER, 'error') as error:
+            sos.reductions.precompute(map(sos.reductions.reference, names))
+        return error
+
+    def computed(self, name):
+        return 'pathlist' in self.reference(name).__dict__
+
+    def testFailedDependency(self):
+        error = self.precompute('z', 'w')
+        error.assert_not_called()
+        self.assertTrue(self.computed('bad'))
+        self.assertTrue(self.computed('w'))
+        for name in ('x', 'y', 'z'):
+            self.assertFalse(self.computed(name))
+
+    def testCircular(self):
+        error = self.precompute('circular_a', 'w')
+        error.assert_called_once()
+        self.assertIn('circular_a', error.call_args.args[0])
+        self.assertTrue(self.computed('w'))
+
+    def testThreads(self):
+        # Load the reductions first, as loading also uses a thread pool
+        soses = {threads: self.sosreport(reductions_threads=threads)
+                 for threads in ('0', '2', '1')}
+        for sos in soses.values():
+            sos.reductions
+        for threads, max_workers in (('0', None), ('2', 2)):
+            with self.subTest(threads=threads):
+                with mock.patch.object(reductions.futures, 'ThreadPoolExecutor',
+                                       wraps=reductions.futures.ThreadPoolExecutor) as executor:
+                    self.precompute('w', sos=soses[threads])
+                executor.assert_called_once_with(max_workers=max_workers)
+                self.assertIn('pathlist', soses[threads].reductions.reference('w').__dict__)
+        # With 1 thread, nothing is precomputed
+        with mock.patch.object(reductions.futures, 'ThreadPoolExecutor') as executor:
+            self.precompute('w', sos=soses['1'])
+        executor.assert_not_called()
+        self.assertNotIn('pathlist', soses['1'].reductions.reference('w').__dict__)
+
+
+class TransformReferenceTest(ReductionTestCase):
+    REDUCTIONS = '''
+- {name: hostname, type: file, source: etc/hostname}
+- {name: upper, type: exec, source: hostname, exec: tr, params: [a-z, A-Z]}
+- {name: fails, type: exec, source: hostname, exec: 'false'}
+- {name: bad, type: file, source: etc/bad.yaml}
+- {name: raises, type: yaml2json, source: bad}
+'''
+    FILES = {
+        'etc/hostname': 'host\n',
+        'etc/bad.yaml': 'a: [b\n',
+    }
+
+    def testExec(self):
+        self.assertEqual(self.reference('upper').value, b'HOST\n')
+        self.assertEqual(self.sos.analysis_files['upper'], b'HOST\n')
+        self.assertEqual(self.reference('upper').transform(b'other'), b'OTHER')
+
+    def testExecFailure(self):
+        self.assertIsNone(self.reference('fails').value)
+        self.assertNotIn('fails', self.sos.analysis_files)
+        self.assertIsNone(self.reference('fails').transform(b'other'))
+
+    def testTransformRaises(self):
+        with self.assertRaises(Exception):
+            self.reference('raises').pathlist
+        # No empty or partial file is left behind
+        self.assertNotIn('raises', self.sos.analysis_files)
+
+
+class DirDictTest(unittest.TestCase):
+    def setUp(self):
+        testdir = tempfile.TemporaryDirectory()
+        self.addCleanup(testdir.cleanup)
+        self.dirpath = Path(testdir.name) / 'dir'
+        self.dirdict = DirDict(self.dirpath)
+
+    def testOpenRead(self):
+        for mode in ('rb', 'r'):
+            with self.subTest(mode=mode):
+                with self.assertRaises(FileNotFoundError):
+                    self.dirdict.open('key', mode)
+                self.assertFalse(self.dirpath.exists())
+
+    def testOpenWrite(self):
+        for mode in ('wb', 'ab', 'xb', 'r+b'):
+            with self.subTest(mode=mode):
+                if mode == 'r+b':
+                    self.dirdict['key'] = b''
+                else:
+                    self.dirdict.pop('key', None)
+                with self.dirdict.open('key', mode) as f:
+                    f.write(b'value')
+                self.assertEqual(self.dirdict['key'], b'value')
+
+
+class ReferencePathTest(ReductionTestCase):
+    FILES = {
+        'etc/lines': 'a\nbb\n\nccc',
+        'etc/other': 'other\n',
+    }
+
+    def path(self, name):
+        return ReferencePath(self.sos.filesdir / name, sos=self.sos)
+
+    def lines(self, path):
+        return [(line.value, line.first_line_number, line.last_line_number)
+                for line in path.line_iterator]
+
+    def testLineIterator(self):
+        self.assertEqual(self.lines(self.path('etc/lines')),
+                         [(b'a\n', 1, 1), (b'bb\n', 2, 2), (b'\n', 3, 3), (b'ccc', 4, 4)])
+
+    def testSliceLineIterator(self):
+        path = self.path('etc/lines')
+        self.assertEqual(self.lines(path.slice(2, 4)), [(b'bb\n', 2, 2), (b'\n', 3, 3)])
+        # The last line is cut off at the end of the slice
+        self.assertEqual(self.lines(path.slice(3, 4)),
+                         [(b'b\n', 2, 2), (b'\n', 3, 3), (b'c', 4, 4)])
+        self.assertEqual(self.lines(path.slice(2, 2)), [(b'bb', 2, 2)])
+        # A slice of a slice
+        self.assertEqual(self.lines(path.slice(2, 4).slice(1, 2)), [(b'b\n', 2, 2)])
+
+    def testListValue(self):
+        lines = list(self.path('etc/lines').line_iterator)
+        other = self.path('etc/other')
+        for paths in [lines,
+                      lines[1:3],
+                      [lines[0], lines[2]],
+                      lines[::-1],
+                      [lines[0], other, lines[1], lines[2]],
+                      [lines[1].slice(1), lines[2], self.path('etc/lines').slice(6, 2)]]:
+            with self.subTest(paths=paths):
+                self.assertEqual(ReferencePathList(paths).value,
+                                 b''.join(p.value for p in paths))
+        self.assertEqual(ReferencePathList([]).value, b'')
+
+
+class PathLineOffsetsTest(unittest.TestCase):
+    def offsets(self, content):
+        testdir = tempfile.TemporaryDirectory()
+        self.addCleanup(testdir.cleanup)
+        path = Path(testdir.name) / 'file'
+        path.write_bytes(content)
+        return PathLineOffsets(path)
+
+    def testLine(self):
+        offsets = self.offsets(b'a\nbb\n\nccc')
+        self.assertEqual(offsets.line_offsets, [0, 2, 5, 6, 9])
+        for offset in range(-1, 11):
+            with self.subTest(offset=offset):
+                # The count of offsets up to this one, as line() used to count them
+                line = len([o for o in offsets.line_offsets if o <= offset])
+                self.assertEqual(offsets.line(offset),
+                                 None if line == len(offsets.line_offsets) else line)
+        self.assertEqual([offsets.line(o) for o in (0, 1, 2, 5, 6, 8, 9)],
+                         [1, 1, 2, 3, 4, 4, None])
+        self.assertEqual(offsets.line_range(3, 3), (2, 3))
+        self.assertEqual(offsets.line_range(6, 10), (4, 4))
+
+    def testEmpty(self):
+        offsets = self.offsets(b'')
+        self.assertIsNone(offsets.line(0))
+        self.assertEqual(offsets.last_line(), 0)
+
+
+class RegexReferenceTest(ReductionTestCase):
+    REDUCTIONS = '''
+- {name: lines, type: file, source: etc/lines}
+- {name: match, type: regex, source: lines, pattern: '^b.*$'}
+- {name: ignorecase, type: regex, source: lines, pattern: '^B.*$', ignorecase: true}
+- {name: split, type: splitlines, source: lines}
+- {name: literal, type: regex, source: split, pattern: 'b+\\n'}
+- {name: noliteral, type: regex, source: split, pattern: '[0-9]+'}
+- {name: posix, type: regex, source: split, pattern: '[[:digit:]]x'}
+'''
+    FILES = {
+        'etc/lines': 'a\nbb\nBbb\nccc\n1x\n',
+    }
+
+    def value(self, name):
+        return self.reference(name).value
+
+    def testRegexModule(self):
+        self.assertIs(regex_module(), re)
+        self.assertIs(regex_module('re'), re)
+        with self.assertLogs('saucery.reduction.reference.regex', 'WARNING'):
+            self.assertIs(regex_module('saucery_test_missing_module'), re)
+
+    def testMissingRegexModule(self):
+        self._sos = self.sosreport(regex='saucery_test_missing_regex_module')
+        with self.assertLogs('saucery.reduction.reference.regex', 'WARNING'):
+            self.assertEqual(self.value('match'), b'bb')
+        self.assertEqual(self.value('ignorecase'), b'bbBbb')
+
+    def testRegexLiteral(self):
+        self.assertEqual(regex_literal(b'error: [0-9]+ failed'), b'error: ')
+        self.assertEqual(regex_literal(b'(?m)^bb$'), b'bb')
+        self.assertIsNone(regex_literal(b'(?i)error'))
+        self.assertIsNone(regex_literal(b'[0-9]+'))
+        self.assertIsNone(regex_literal(b'(a|b)'))
+        self.assertIsNone(regex_literal(b'bad['))
+
+    def testRegexLiteralUnavailable(self):
+        with mock.patch.object(regex, 'sre_parse', None):
+            self.assertIsNone(regex_literal(b'error'))
+        # The private parser changed
+        with mock.patch.object(regex, 'sre_parse', SimpleNamespace()):
+            self.assertIsNone(regex_literal(b'error'))
+
+    def testPrefilter(self):
+        self.assertEqual(self.reference('literal')._literal, b'\n')
+        self.assertEqual(self.value('literal'), b'bb\nbb\n')
+        self.assertIsNone(self.reference('noliteral')._literal)
+        self.assertEqual(self.value('noliteral'), b'1')
+
+    def testNoPrefilter(self):
+        with mock.patch.object(regex, 'sre_parse', None):
+            self.assertIsNone(self.reference('literal')._literal)
+            self.assertEqual(self.value('literal'), b'bb\nbb\n')
+
+    def testPosixClass(self):
+        # 're' doesn't support POSIX classes, so this is parsed as a class and then the
+        # literal ']x'; so it doesn't match, and the prefilter skips every line
+        with warnings.catch_warnings():
+            # 're' warns that this looks like a nested set
+            warnings.simplefilter('ignore', FutureWarning)
+            self.assertEqual(self.reference('posix')._literal, b']x')
+            self.assertEqual(self.value('posix'), b'')
+        # Other modules do support them, so their patterns must not be prefiltered
+        posix = SimpleNamespace(compile=lambda p: re.compile(p.replace(b'[[:digit:]]', b'\\d')))
+        with mock.patch.dict(sys.modules, {'saucery_test_posix': posix}):
+            self._sos = self.sosreport(regex='saucery_test_posix')
+            self.assertIsNone(self.reference('posix')._literal)
+            self.assertEqual(self.value('posix'), b'1x')
+
+
+class AnalysisTest(ReductionTestCase):
+    REDUCTIONS = '''
+- {name: hostname, type: file, source: etc/hostname}
+- {name: info, type: analysis, source: hostname, level: info}
+- {name: warning, type: analysis, source: hostname, level: warning}
+- name: both
+  type: and
+  source: hostname
+  level: error
+  and: [{type: analysis}, {type: analysis}]
+'''
+    FILES = {
+        'etc/hostname': 'host\n',
+    }
+
+    def names(self, analysis):
+        return {c['name'] for c in analysis.conclusions}
+
+    def testLevel(self):
+        self.assertLessEqual({'info', 'warning', 'both'}, self.names(SOSAnalysis(self.sos)))
+        analysis = SOSAnalysis(self.sosreport(level='warning'))
+        self.assertEqual(self.names(analysis), {'warning', 'both'})
+
+    def testLogicalSubAnalyses(self):
+        # Each listed sub-analysis uses the logical analysis' source, and has its own
+        # conclusion, even if identical
+        analyses = self.sos.reductions.analysis('both').analyses
+        self.assertEqual(len(analyses), 2)
+        for analysis in analyses:
+            self.assertIs(analysis.source, self.reference('hostname'))
+            self.assertEqual(analysis.source_value, b'host\n')
+        self.assertEqual(len(SOSAnalysis(self.sos).conclusions), 5)
+
+
+class DefinitionFieldTest(unittest.TestCase):
+    def testConvert(self):
+        for fieldclasses, value, converted in [(bool, 'Yes', True),
+                                               (bool, 'false', False),
+                                               (int, '12', 12),
+                                               (str, b'abc', 'abc'),
+                                               (str, 12, '12'),
+                                               (bytes, 'abc', b'abc'),
+                                               (dict, {'a': 1}, {'a': 1}),
+                                               ([str, list], 'a', ['a']),
+                                               ([str, list], ['a'], ['a']),
+                                               ([str, int], '12', '12'),
+                                               (int, None, None)]:
+            with self.subTest(fieldclasses=fieldclasses, value=value):
+                self.assertEqual(DefinitionField(fieldclasses).convert(value), converted)
+
+    def testConvertFailure(self):
+        # Values that can't be converted are left as they are, for check() to reject
+        for fieldclasses, value in [(int, 'x'),
+                                    (int, float('inf')),
+                                    (int, [1]),
+                                    (bytes, -1),
+                                    (bytes, ['a']),
+                                    (str, b'\xff')]:
+            with self.subTest(fieldclasses=fieldclasses, value=value):
+                self.assertEqual(DefinitionField(fieldclasses).convert(value), value)
+
+    def testConvertUnchanged(self):
+        field = DefinitionField(bool)
+        self.assertIs(field.convert(True), True)
+        self.assertIs(field.convert(False), False)
+        self.assertIs(field.convert(1), True)
+        self.assertIs(field.convert(0), False)
+        self.assertEqual(field.convert('maybe'), 'maybe')
+        field = DefinitionField(int)
+        value = 2 ** 80
+        self.assertIs(field.convert(value), value)
+        # bool is an int subclass, but is still converted
+        self.assertIs(type(field.convert(True)), int)
+
+    def testCheck(self):
+        field = DefinitionField([str, list])
+        for value in ['a', ['a'], None]:
+            with self.subTest(value=value):
+                field.check(value)
+        for value in [1, {'a': 1}, b'a']:
+            with self.subTest(value=value):
+                with self.assertRaisesRegex(InvalidDefinitionError, 'invalid .* field'):
+                    field.check(value)
+
+
+class DefinitionTest(ReductionTestCase):
+    def definition(self, **fields):
+        return Definition({'name': 'test', 'type': 'regex', 'source': 'lines', 'pattern': 'a',
+                           **fields}, self.sos.reductions)
+
+    def testNullField(self):
+        self.assertIsNone(self.definition(ignorecase=None).get('ignorecase'))
+
+    def testWrongTypeField(self):
+        with self.assertRaisesRegex(InvalidDefinitionError, r'RegexReference\(test\).*bool'):
+            self.definition(ignorecase={'a': 1})
+
+
+class FindFilesTest(unittest.TestCase):
+    def setUp(self):
+        self.testdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.testdir.cleanup)
+        self.testpath = Path(self.testdir.name)
+        for name in ['a.yaml', 'b.JSON', 'c.Yaml', 'd.yml', 'e.txt', 'noext', '.hidden.yaml',
+                     'sub/f.json', 'sub/g.yaml', 'sub/deeper/h.YAML', '.hiddendir/i.yaml',
+                     'other/j.json', 'linked/k.yaml']:
+            path = self.testpath / 'tree' / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text('')
+        (self.testpath / 'tree' / 'symlink').symlink_to(self.testpath / 'tree' / 'linked')
+
+    def testSameAsRglob(self):
+        tree = self.testpath / 'tree'
+        files = {'json': [], 'yaml': []}
+        reductions.Reductions._find_files(tree, files)
+        self.assertEqual(files, {'json': list(tree.rglob('[!.]*.[jJ][sS][oO][nN]')),
+                                 'yaml': list(tree.rglob('[!.]*.[yY][aA][mM][lL]'))})
+        self.assertEqual(len(files['yaml']), 6)
+
+    def testMissing(self):
+        files = {'json': [], 'yaml': []}
+        reductions.Reductions._find_files(self.testpath / 'missing', files)
+        self.assertEqual(files, {'json': [], 'yaml': []})
+
+
+class ReductionsCacheTest(ReductionTestCase):
+    REDUCTIONS = '''
+- {name: hostname, type: file, source: etc/hostname}
+'''
+
+    @property
+    def cachedir(self):
+        return reductions.cachedir()
+
+    def trees(self):
+        return [p for p in self.cachedir.iterdir() if p.name.startswith('tree-')]
+
+    def testFileCache(self):
+        self.assertIsNotNone(self.sosreport().reductions.get('hostname'))
+        for tree in self.trees():
+            tree.unlink()
+        # Loaded from the file's own cache, without parsing it
+        with mock.patch.object(reductions.yaml, 'load', side_effect=AssertionError):
+            self.assertIsNotNone(self.sosreport().reductions.get('hostname'))
+
+    def testChanged(self):
+        self.assertIsNone(self.sosreport().reductions.get('other'))
+        path = self.reductionsdir / 'test.yaml'
+        path.write_text(self.REDUCTIONS + '- {name: other, type: file, source: etc/other}\n')
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1))
+        self.assertIsNotNone(self.sosreport().reductions.get('other'))
+
+    def testNoCache(self):
+        for nocache in ('1', 'true', 'Yes'):
+            with self.subTest(nocache=nocache):
+                self.assertIsNotNone(self.sosreport(reductions_nocache=nocache)
+                                     .reductions.get('hostname'))
+                self.assertFalse(self.cachedir.exists())
+        self.assertIsNotNone(self.sosreport(reductions_nocache='0').reductions.get('hostname'))
+        self.assertTrue(self.cachedir.exists())
+
+    def testPrune(self):
+        self.cachedir.mkdir(parents=True)
+        old = self.cachedir / 'old'
+        old.write_bytes(b'')
+        os.utime(old, (0, 0))
+        for i in range(reductions.TREE_CACHE_KEEP + 2):
+            tree = self.cachedir / f'tree-{i}'
+            tree.write_bytes(b'')
+            os.utime(tree, (i, i))
+        self.sosreport().reductions
+        self.assertFalse(old.exists())
+        self.assertFalse((self.cachedir / 'tree-0').exists())
+        self.assertEqual(len(self.trees()), reductions.TREE_CACHE_KEEP)
+
+    def testTreeCache(self):
+        self.assertIsNotNone(self.sosreport().reductions.get('hostname'))
+        self.assertEqual(len(self.trees()), 1)
+        # Loaded from the tree cache, without reading any file's own cache
+        with mock.patch.object(reductions, 'cache_read',
+                               wraps=reductions.cache_read) as cache_read:
+            self.assertIsNotNone(self.sosreport().reductions.get('hostname'))
+        cache_read.assert_called_once()
+        self.assertEqual(len(self.trees()), 1)
+
+    def testFingerprintMissingFile(self):
+        files = {'json': [], 'yaml': [self.testpath / 'missing.yaml']}
+        self.assertIsNone(reductions.Reductions._fingerprint(files))
@@ -1,10 +1,12 @@
 
+import os
 import shutil
 import tempfile
 import unittest
 
 from pathlib import Path
 from saucery import Saucery
+from unittest import mock
 
 
 TEST_DATA_PATH = Path(__file__).parent / 'saucery_data'
@@ -15,6 +17,11 @@ TEST_SOS = 'sosreport-sosreport-f-123456-2022-05-23-qcpndam.tar.xz'
 class SauceryTest(unittest.TestCase):
     def setUp(self):
         self.testdir = tempfile.TemporaryDirectory()
+        # Keep the reductions cache out of the user's cache dir
+        environ = mock.patch.dict(os.environ,
+                                  {'XDG_CACHE_HOME': str(Path(self.testdir.name) / 'cache')})
+        environ.start()
+        self.addCleanup(environ.stop)
         saucery = shutil.copytree(TEST_DATA_PATH, Path(self.testdir.name) / 'saucery')
         self.saucery = Saucery(saucery=saucery, reductions=TEST_REDUCTIONS_PATH)
         self.addCleanup(self.testdir.cleanup)